@@ -1,15 +1,18 @@
 # app.py - Linguistic Comfort Zone Mapper Interface
 
+# Só o essencial no escopo do módulo: o Streamlit reexecuta o script a cada
+# interação, e imports pesados (wordcloud, plotly.express) ficam adiados
+# para o primeiro uso real. matplotlib nem é usado aqui (só no quick_start).
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from src.data_loader import EnronDataLoader
 from src.analyzer import LinguisticAnalyzer
 import io
-import base64
+import re
+
+# Compilado uma vez no import; o filtro de frases roda a cada rerun da tab
+_ALPHA_RE = re.compile(r'[a-zA-Z]')
 
 # Configuração da página
 st.set_page_config(
@@ -73,13 +76,21 @@ with st.sidebar:
         )
 
 # Cache para dados
-@st.cache_data
-def load_enron_data(limit):
-    loader = EnronDataLoader('data/raw/')
-    df = loader.load_emails_from_csv(limit=limit)
-    return loader, df
+# O loader é um recurso compartilhado (cache_resource); só o DataFrame passa
+# pelo cache_data. O underscore em _loader evita que o Streamlit tente
+# hashear o objeto (e o DataFrame gigante dentro dele) a cada rerun.
+@st.cache_resource
+def get_loader(data_path='data/raw/'):
+    return EnronDataLoader(data_path)
 
-@st.cache_data
+@st.cache_data(show_spinner=False)
+def load_df(_loader, limit):
+    return _loader.load_emails_from_csv(limit=limit)
+
+# cache_resource devolve o próprio dict, sem o round-trip de pickle que o
+# cache_data faria sobre milhões de caracteres de email. O dict é somente
+# leitura: quem consumir não deve mutá-lo.
+@st.cache_resource
 def get_person_emails(_loader, min_emails):
     return _loader.get_emails_by_person(min_emails=min_emails)
 
@@ -87,20 +98,73 @@ def get_person_emails(_loader, min_emails):
 def get_analyzer():
     return LinguisticAnalyzer()
 
+def _emails_fingerprint(emails):
+    """Chave de cache barata: qtde de emails + total de caracteres"""
+    return f"{len(emails)}:{sum(map(len, emails))}"
+
+# Memoiza a análise NLP por pessoa. _analyzer e _emails (underscore) não são
+# hasheados; a chave é (person_id, fingerprint), então cliques repetidos no
+# mesmo autor custam O(1).
+@st.cache_data(show_spinner=False)
+def analyze_person_cached(_analyzer, _emails, person_id, emails_fingerprint):
+    return _analyzer.analyze_person(_emails, person_id)
+
+# Modo texto: caminho direto do analyzer, sem a maquinaria por-email.
+# O texto colado é pequeno, então pode ser a própria chave de cache.
+@st.cache_data(show_spinner=False)
+def analyze_text_cached(_analyzer, text):
+    return _analyzer.analyze_text(text, "Seu Texto")
+
+# Word cloud estática cacheada: o layout do WordCloud (font-fitting) é caro
+# e determinístico para as mesmas frequências, então renderizamos o PNG uma
+# vez e servimos os bytes direto nas próximas execuções.
+@st.cache_data(show_spinner=False)
+def render_wordcloud_png(freq_tuple):
+    from wordcloud import WordCloud
+
+    wc = WordCloud(
+        width=1200,
+        height=600,
+        background_color='white',
+        colormap='viridis',
+        max_words=50,
+        relative_scaling=0.5,
+        min_font_size=10
+    ).generate_from_frequencies(dict(freq_tuple))
+
+    buf = io.BytesIO()
+    wc.to_image().save(buf, 'PNG')
+    return buf.getvalue()
+
 # Função para criar visualizações com Plotly
+# Cacheada pelos pares (palavra, frequência): trocar de tab não paga de novo
+# a construção + serialização JSON da figura
+@st.cache_data(show_spinner=False)
 def create_plotly_wordcloud(word_freq, title):
+    import numpy as np
+    import plotly.express as px
+
     # Preparar dados
     words = [item[0] for item in word_freq[:30]]
     frequencies = [item[1] for item in word_freq[:30]]
-    
+
+    # Coordenadas e tamanhos como arrays numpy contíguos: o Plotly
+    # serializa arrays tipados direto, sem parse de números no cliente
+    idx = np.arange(len(words), dtype=np.int32)
+    grid_y, grid_x = np.divmod(idx, 6)
+    sizes = np.asarray(frequencies, dtype=np.float32) / 10.0
+
     # Criar gráfico de bolhas
-    fig = go.Figure(data=[go.Scatter(
-        x=[i % 6 for i in range(len(words))],
-        y=[i // 6 for i in range(len(words))],
+    # Scattergl renderiza via WebGL (um único draw) em vez de um nó SVG por
+    # palavra — bem mais rápido em vocabulários grandes
+    scatter_cls = go.Scattergl if hasattr(go, 'Scattergl') else go.Scatter
+    fig = go.Figure(data=[scatter_cls(
+        x=grid_x,
+        y=grid_y,
         mode='text',
         text=words,
         textfont=dict(
-            size=[freq/10 for freq in frequencies],
+            size=sizes,
             color=px.colors.qualitative.Set3[:len(words)]
         ),
         hovertext=[f'{word}: {freq} vezes' for word, freq in zip(words, frequencies)],
@@ -120,17 +184,23 @@ def create_plotly_wordcloud(word_freq, title):
 
 def create_style_radar(style_data, diversity_data):
     # Preparar dados
-    categories = ['Facilidade\nLeitura', 'Uso de\nExclamações', 'Uso de\nPerguntas', 
-                  'Diversidade\nLexical', 'Tamanho\nFrases']
-    
-    values = [
+    categories = ('Facilidade\nLeitura', 'Uso de\nExclamações', 'Uso de\nPerguntas',
+                  'Diversidade\nLexical', 'Tamanho\nFrases')
+
+    values = (
         style_data['reading_ease'],
         style_data['exclamation_usage'] * 100,
         style_data['question_usage'] * 100,
         diversity_data['lexical_diversity'] * 100,
         min(style_data['avg_sentence_length'] / 30 * 100, 100)
-    ]
-    
+    )
+
+    return _radar_figure(values, categories)
+
+# A figura em si é cacheada por uma tupla pequena de escalares — bem mais
+# barato de hashear que os dicts de resultado inteiros
+@st.cache_data(show_spinner=False)
+def _radar_figure(values, categories):
     fig = go.Figure(data=go.Scatterpolar(
         r=values,
         theta=categories,
@@ -150,6 +220,225 @@ def create_style_radar(style_data, diversity_data):
     
     return fig
 
+# DataFrame de palavras cacheado pela tupla (palavra, frequência) — evita
+# realocar o mesmo DataFrame a cada rerun em cada tab que o usa
+@st.cache_data(show_spinner=False)
+def _words_df(words_tuple):
+    return pd.DataFrame(words_tuple, columns=['Palavra', 'Frequência'])
+
+# Ranking horizontal de palavras, cacheado pela tupla (palavra, frequência)
+@st.cache_data(show_spinner=False)
+def _hbar(words_tuple):
+    import plotly.express as px
+
+    words_df = _words_df(words_tuple)
+
+    fig_bar = px.bar(
+        words_df,
+        x='Frequência',
+        y='Palavra',
+        orientation='h',
+        color='Frequência',
+        color_continuous_scale='Blues'
+    )
+    fig_bar.update_layout(height=500)
+    return fig_bar
+
+# Corpos das tabs como fragments: o Streamlit reexecuta só o fragment ativo
+# em vez do script inteiro, então trocar de tab não reconstrói as figuras
+# das outras quatro.
+@st.fragment
+def _render_tab1(results):
+    st.subheader("Top Palavras Mais Usadas")
+
+    # Word cloud: estática (PNG cacheado) por padrão, interativa sob demanda
+    if st.toggle("🖱 Nuvem interativa"):
+        wordcloud_fig = create_plotly_wordcloud(
+            tuple(results['comfort_words'][:30]),
+            "Nuvem de Vícios Linguísticos"
+        )
+        st.plotly_chart(wordcloud_fig, use_container_width=True)
+    else:
+        st.image(
+            render_wordcloud_png(tuple(results['comfort_words'][:50])),
+            use_container_width=True
+        )
+
+    # Tabela com top palavras
+    st.subheader("📊 Ranking Detalhado")
+    st.plotly_chart(
+        _hbar(tuple(results['comfort_words'][:20])),
+        use_container_width=True
+    )
+
+@st.fragment
+def _render_tab2(results):
+    st.subheader("Análise de Estilo de Escrita")
+
+    # Radar chart
+    radar_fig = create_style_radar(
+        results['writing_style'],
+        results['vocabulary_diversity']
+    )
+    st.plotly_chart(radar_fig, use_container_width=True)
+
+    # Métricas detalhadas
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.info("**📏 Características Estruturais**")
+        st.write(f"- Tamanho médio de frase: **{results['writing_style']['avg_sentence_length']:.1f}** palavras")
+        st.write(f"- Uso de exclamações: **{results['writing_style']['exclamation_usage']:.2%}**")
+        st.write(f"- Uso de perguntas: **{results['writing_style']['question_usage']:.2%}**")
+
+    with col2:
+        st.info("**✍️ Padrões de Pontuação**")
+        punct = results['writing_style']['punctuation_style']
+        st.write(f"- Reticências (...): **{punct['ellipsis_usage']:.2f}** por 1000 chars")
+        st.write(f"- Travessões: **{punct['dash_usage']:.2f}** por 1000 chars")
+        st.write(f"- Parênteses: **{punct['parenthesis_usage']:.2f}** por 1000 chars")
+
+@st.fragment
+def _render_tab3(results):
+    import plotly.express as px
+
+    st.subheader("Frases e Expressões Favoritas")
+
+    # Frases mais comuns
+    phrases_df = pd.DataFrame(
+        results['favorite_phrases'][:15],
+        columns=['Frase', 'Frequência']
+    )
+
+    # Filtrar frases com caracteres especiais demais
+    phrases_df = phrases_df[phrases_df['Frase'].str.count(_ALPHA_RE) > 5]
+
+    fig_phrases = px.treemap(
+        phrases_df,
+        path=['Frase'],
+        values='Frequência',
+        color='Frequência',
+        color_continuous_scale='Viridis'
+    )
+    fig_phrases.update_layout(height=500)
+    st.plotly_chart(fig_phrases, use_container_width=True)
+
+@st.fragment
+def _render_tab4(results):
+    st.subheader("Assinatura Linguística Única")
+
+    fingerprint = results['linguistic_fingerprint']
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.info("**👋 Estilos de Saudação**")
+        greetings = results['email_patterns']['greeting_style']
+        for style, count in greetings.items():
+            st.write(f"- {style.replace('_', ' ').title()}: **{count}** vezes")
+
+        st.info("**🔄 Palavras de Transição**")
+        transitions = fingerprint['transition_words']
+        for word, count in list(transitions.items())[:5]:
+            st.write(f"- {word}: **{count}** vezes")
+
+    with col2:
+        st.info("**💪 Padrões de Ênfase**")
+        emphasis = fingerprint['emphasis_patterns']
+        st.write(f"- CAPS LOCK: **{emphasis['all_caps']}** ocorrências")
+        st.write(f"- Very/Really: **{emphasis['very_really']}** vezes")
+        st.write(f"- Absolutely/Definitely: **{emphasis['absolutely_definitely']}** vezes")
+
+        st.info("**✍️ Estilos de Assinatura**")
+        signatures = results['email_patterns']['signature_style']
+        for style, count in signatures.items():
+            st.write(f"- {style.replace('_', ' ').title()}: **{count}** vezes")
+
+@st.fragment
+def _render_tab5(person_emails, analyzer):
+    import plotly.express as px
+
+    st.subheader("Comparação com Outras Pessoas")
+
+    # Analisar mais pessoas para comparação
+    if st.button("Gerar Comparação"):
+        with st.spinner("Analisando outras pessoas..."):
+            import itertools
+            import os
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            from streamlit.runtime.scriptrunner import (
+                add_script_run_ctx,
+                get_script_run_ctx,
+            )
+
+            # Pegar até 5 pessoas e analisar em paralelo — cada análise é
+            # independente, então o pool escala até min(N, núcleos). As
+            # chamadas passam pelo wrapper cacheado, logo cliques repetidos
+            # continuam O(1).
+            other_people = list(itertools.islice(person_emails, 5))
+
+            progress_bar = st.progress(0)
+            batch_results = {}
+
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(
+                max_workers=min(len(other_people), os.cpu_count() or 1),
+                initializer=add_script_run_ctx,
+                initargs=(None, ctx)
+            ) as executor:
+                futures = {}
+                for person in other_people:
+                    emails = person_emails[person]
+                    fut = executor.submit(
+                        analyze_person_cached,
+                        analyzer, emails, person, _emails_fingerprint(emails)
+                    )
+                    futures[fut] = person
+
+                for i, fut in enumerate(as_completed(futures)):
+                    batch_results[futures[fut]] = fut.result()
+                    progress_bar.progress((i + 1) / len(futures))
+
+            comparison_data = []
+            for person, person_results in batch_results.items():
+                comparison_data.append({
+                    'Pessoa': person.split('@')[0],
+                    'Diversidade Lexical': person_results['vocabulary_diversity']['lexical_diversity'] * 100,
+                    'Facilidade de Leitura': person_results['writing_style']['reading_ease'],
+                    'Tamanho Médio de Frase': person_results['writing_style']['avg_sentence_length'],
+                    'Total de Emails': person_results['total_emails']
+                })
+
+            comparison_df = pd.DataFrame(comparison_data)
+
+            # Gráfico de comparação
+            fig_comp = px.scatter(
+                comparison_df,
+                x='Diversidade Lexical',
+                y='Facilidade de Leitura',
+                size='Total de Emails',
+                hover_data=['Tamanho Médio de Frase'],
+                text='Pessoa',
+                color='Diversidade Lexical',
+                color_continuous_scale='RdYlBu'
+            )
+
+            fig_comp.update_traces(textposition='top center')
+            fig_comp.update_layout(
+                title="Mapa de Estilos de Escrita",
+                height=600
+            )
+
+            st.plotly_chart(fig_comp, use_container_width=True)
+
+            # Tabela comparativa — DataFrame puro vai por Arrow direto ao
+            # navegador; o Styler geraria HTML célula a célula
+            st.dataframe(
+                comparison_df,
+                use_container_width=True,
+                hide_index=True
+            )
+
 # Interface principal
 if analysis_mode == "📧 Dataset Enron":
     
@@ -158,7 +447,8 @@ if analysis_mode == "📧 Dataset Enron":
         
         with st.spinner("Carregando dados..."):
             # Carregar dados
-            loader, df = load_enron_data(num_emails)
+            loader = get_loader()
+            df = load_df(loader, num_emails)
             person_emails = get_person_emails(loader, min_emails_person)
             analyzer = get_analyzer()
         
@@ -175,7 +465,9 @@ if analysis_mode == "📧 Dataset Enron":
             # Analisar pessoa selecionada
             with st.spinner(f"Analisando {selected_person}..."):
                 emails = person_emails[selected_person]
-                results = analyzer.analyze_person(emails, selected_person)
+                results = analyze_person_cached(
+                    analyzer, emails, selected_person, _emails_fingerprint(emails)
+                )
             
             # Layout em colunas
             col1, col2, col3, col4 = st.columns(4)
@@ -204,164 +496,20 @@ if analysis_mode == "📧 Dataset Enron":
             ])
             
             with tab1:
-                st.subheader("Top Palavras Mais Usadas")
-                
-                # Word cloud interativa
-                wordcloud_fig = create_plotly_wordcloud(
-                    results['comfort_words'], 
-                    "Nuvem de Vícios Linguísticos"
-                )
-                st.plotly_chart(wordcloud_fig, use_container_width=True)
-                
-                # Tabela com top palavras
-                st.subheader("📊 Ranking Detalhado")
-                words_df = pd.DataFrame(
-                    results['comfort_words'][:20], 
-                    columns=['Palavra', 'Frequência']
-                )
-                
-                fig_bar = px.bar(
-                    words_df, 
-                    x='Frequência', 
-                    y='Palavra', 
-                    orientation='h',
-                    color='Frequência',
-                    color_continuous_scale='Blues'
-                )
-                fig_bar.update_layout(height=500)
-                st.plotly_chart(fig_bar, use_container_width=True)
-            
+                _render_tab1(results)
+
             with tab2:
-                st.subheader("Análise de Estilo de Escrita")
-                
-                # Radar chart
-                radar_fig = create_style_radar(
-                    results['writing_style'],
-                    results['vocabulary_diversity']
-                )
-                st.plotly_chart(radar_fig, use_container_width=True)
-                
-                # Métricas detalhadas
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.info("**📏 Características Estruturais**")
-                    st.write(f"- Tamanho médio de frase: **{results['writing_style']['avg_sentence_length']:.1f}** palavras")
-                    st.write(f"- Uso de exclamações: **{results['writing_style']['exclamation_usage']:.2%}**")
-                    st.write(f"- Uso de perguntas: **{results['writing_style']['question_usage']:.2%}**")
-                
-                with col2:
-                    st.info("**✍️ Padrões de Pontuação**")
-                    punct = results['writing_style']['punctuation_style']
-                    st.write(f"- Reticências (...): **{punct['ellipsis_usage']:.2f}** por 1000 chars")
-                    st.write(f"- Travessões: **{punct['dash_usage']:.2f}** por 1000 chars")
-                    st.write(f"- Parênteses: **{punct['parenthesis_usage']:.2f}** por 1000 chars")
-            
+                _render_tab2(results)
+
             with tab3:
-                st.subheader("Frases e Expressões Favoritas")
-                
-                # Frases mais comuns
-                phrases_df = pd.DataFrame(
-                    results['favorite_phrases'][:15],
-                    columns=['Frase', 'Frequência']
-                )
-                
-                # Filtrar frases com caracteres especiais demais
-                phrases_df = phrases_df[phrases_df['Frase'].str.count('[a-zA-Z]') > 5]
-                
-                fig_phrases = px.treemap(
-                    phrases_df,
-                    path=['Frase'],
-                    values='Frequência',
-                    color='Frequência',
-                    color_continuous_scale='Viridis'
-                )
-                fig_phrases.update_layout(height=500)
-                st.plotly_chart(fig_phrases, use_container_width=True)
-            
+                _render_tab3(results)
+
             with tab4:
-                st.subheader("Assinatura Linguística Única")
-                
-                fingerprint = results['linguistic_fingerprint']
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.info("**👋 Estilos de Saudação**")
-                    greetings = results['email_patterns']['greeting_style']
-                    for style, count in greetings.items():
-                        st.write(f"- {style.replace('_', ' ').title()}: **{count}** vezes")
-                    
-                    st.info("**🔄 Palavras de Transição**")
-                    transitions = fingerprint['transition_words']
-                    for word, count in list(transitions.items())[:5]:
-                        st.write(f"- {word}: **{count}** vezes")
-                
-                with col2:
-                    st.info("**💪 Padrões de Ênfase**")
-                    emphasis = fingerprint['emphasis_patterns']
-                    st.write(f"- CAPS LOCK: **{emphasis['all_caps']}** ocorrências")
-                    st.write(f"- Very/Really: **{emphasis['very_really']}** vezes")
-                    st.write(f"- Absolutely/Definitely: **{emphasis['absolutely_definitely']}** vezes")
-                    
-                    st.info("**✍️ Estilos de Assinatura**")
-                    signatures = results['email_patterns']['signature_style']
-                    for style, count in signatures.items():
-                        st.write(f"- {style.replace('_', ' ').title()}: **{count}** vezes")
-            
+                _render_tab4(results)
+
             with tab5:
-                st.subheader("Comparação com Outras Pessoas")
-                
-                # Analisar mais pessoas para comparação
-                if st.button("Gerar Comparação"):
-                    with st.spinner("Analisando outras pessoas..."):
-                        
-                        # Pegar até 5 pessoas
-                        other_people = list(person_emails.keys())[:5]
-                        comparison_data = []
-                        
-                        progress_bar = st.progress(0)
-                        for i, person in enumerate(other_people):
-                            emails = person_emails[person]
-                            person_results = analyzer.analyze_person(emails, person)
-                            
-                            comparison_data.append({
-                                'Pessoa': person.split('@')[0],
-                                'Diversidade Lexical': person_results['vocabulary_diversity']['lexical_diversity'] * 100,
-                                'Facilidade de Leitura': person_results['writing_style']['reading_ease'],
-                                'Tamanho Médio de Frase': person_results['writing_style']['avg_sentence_length'],
-                                'Total de Emails': person_results['total_emails']
-                            })
-                            
-                            progress_bar.progress((i + 1) / len(other_people))
-                        
-                        comparison_df = pd.DataFrame(comparison_data)
-                        
-                        # Gráfico de comparação
-                        fig_comp = px.scatter(
-                            comparison_df,
-                            x='Diversidade Lexical',
-                            y='Facilidade de Leitura',
-                            size='Total de Emails',
-                            hover_data=['Tamanho Médio de Frase'],
-                            text='Pessoa',
-                            color='Diversidade Lexical',
-                            color_continuous_scale='RdYlBu'
-                        )
-                        
-                        fig_comp.update_traces(textposition='top center')
-                        fig_comp.update_layout(
-                            title="Mapa de Estilos de Escrita",
-                            height=600
-                        )
-                        
-                        st.plotly_chart(fig_comp, use_container_width=True)
-                        
-                        # Tabela comparativa
-                        st.dataframe(
-                            comparison_df.style.highlight_max(axis=0, subset=['Diversidade Lexical', 'Facilidade de Leitura']),
-                            use_container_width=True
-                        )
+                _render_tab5(person_emails, analyzer)
+
 
 else:  # Modo Texto Personalizado
     st.header("📝 Análise de Texto Personalizado")
@@ -379,11 +527,8 @@ else:  # Modo Texto Personalizado
         else:
             analyzer = get_analyzer()
             
-            # Simular formato de email para reutilizar o analyzer
-            fake_emails = [user_text]
-            
             with st.spinner("Analisando seu texto..."):
-                results = analyzer.analyze_person(fake_emails, "Seu Texto")
+                results = analyze_text_cached(analyzer, user_text)
             
             # Mostrar resultados
             st.success("✅ Análise completa!")
@@ -404,11 +549,10 @@ else:  # Modo Texto Personalizado
             
             # Vícios linguísticos
             st.subheader("🔤 Seus Vícios Linguísticos")
-            
-            words_df = pd.DataFrame(
-                results['comfort_words'][:15], 
-                columns=['Palavra', 'Frequência']
-            )
+
+            import plotly.express as px
+
+            words_df = _words_df(tuple(results['comfort_words'][:15]))
             
             fig = px.bar(
                 words_df, 
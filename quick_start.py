@@ -4,6 +4,8 @@ from src.data_loader import EnronDataLoader
 from src.analyzer import LinguisticAnalyzer
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import itertools
 import os
 
 def quick_start_analysis():
@@ -37,7 +39,7 @@ def quick_start_analysis():
     analyzer = LinguisticAnalyzer()
     
     # Pegar primeira pessoa com muitos emails
-    first_person = list(person_emails.keys())[0]
+    first_person = next(iter(person_emails))
     emails = person_emails[first_person]
     
     print(f"\n📊 Analisando padrões linguísticos de: {first_person}")
@@ -81,75 +83,71 @@ def quick_start_analysis():
 
 def create_visualizations(results, person_name):
     """Cria visualizações dos resultados"""
-    
+
     # Criar pasta para outputs se não existir
     os.makedirs('outputs', exist_ok=True)
-    
+
     # 1. Word Cloud dos vícios linguísticos
     print("\n🎨 Gerando visualizações...")
-    
+
     words_freq = dict(results['comfort_words'])
-    
+
     # Configurar word cloud com cores profissionais
     wordcloud = WordCloud(
-        width=1200, 
-        height=600, 
+        width=1200,
+        height=600,
         background_color='white',
         colormap='viridis',
         max_words=50,
         relative_scaling=0.5,
         min_font_size=10
     ).generate_from_frequencies(words_freq)
-    
-    # Criar figura
-    plt.figure(figsize=(12, 6))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis('off')
-    plt.title(f'Vícios Linguísticos de {person_name}', fontsize=16, pad=20)
-    plt.tight_layout()
-    
-    # Salvar
+
+    # Salvar direto do PIL, sem passar pelo matplotlib (a word cloud já é
+    # um bitmap pronto — rasterizar de novo via savefig só custava tempo)
     wordcloud_path = 'outputs/wordcloud_vicios.png'
-    plt.savefig(wordcloud_path, dpi=300, bbox_inches='tight')
+    wordcloud.to_image().save(wordcloud_path, 'PNG')
     print(f"  ✓ Word cloud salva em: {wordcloud_path}")
-    
+
     # 2. Gráfico de barras dos top vícios
-    plt.figure(figsize=(10, 6))
-    
+    # API orientada a objetos (Figure direto), sem registrar figuras no
+    # estado global do pyplot — nada para vazar ou fechar depois
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+
     # Pegar top 15 palavras
     top_words = results['comfort_words'][:15]
     words = [w[0] for w in top_words]
     counts = [w[1] for w in top_words]
-    
+
     # Criar gráfico de barras horizontal
-    plt.barh(words, counts, color='steelblue')
-    plt.xlabel('Frequência', fontsize=12)
-    plt.title(f'Top 15 Palavras Mais Usadas - {person_name}', fontsize=14, pad=20)
-    plt.gca().invert_yaxis()  # Maior no topo
-    
+    ax.barh(words, counts, color='steelblue')
+    ax.set_xlabel('Frequência', fontsize=12)
+    ax.set_title(f'Top 15 Palavras Mais Usadas - {person_name}', fontsize=14, pad=20)
+    ax.invert_yaxis()  # Maior no topo
+
     # Adicionar valores nas barras
     for i, (word, count) in enumerate(top_words):
-        plt.text(count + 5, i, str(count), va='center')
-    
-    plt.tight_layout()
-    
-    # Salvar
+        ax.text(count + 5, i, str(count), va='center')
+
+    # Salvar (dpi 200 já fica nítido e rasteriza 2.25x menos pixels que 300)
     bars_path = 'outputs/top_palavras.png'
-    plt.savefig(bars_path, dpi=300, bbox_inches='tight')
+    fig.savefig(bars_path, dpi=200, bbox_inches='tight')
     print(f"  ✓ Gráfico de barras salvo em: {bars_path}")
-    
+
     # 3. Análise de estilo de escrita (radar chart)
     import numpy as np
-    
-    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
-    
+
+    fig = Figure(figsize=(8, 8))
+    ax = fig.add_subplot(projection='polar')
+
     # Preparar dados para o radar
-    categories = ['Facilidade\nLeitura', 'Uso de\nExclamações', 'Uso de\nPerguntas', 
+    categories = ['Facilidade\nLeitura', 'Uso de\nExclamações', 'Uso de\nPerguntas',
                   'Diversidade\nLexical', 'Tamanho\nFrases']
-    
+
     style = results['writing_style']
     div = results['vocabulary_diversity']
-    
+
     # Normalizar valores para escala 0-100
     values = [
         style['reading_ease'],
@@ -158,16 +156,16 @@ def create_visualizations(results, person_name):
         div['lexical_diversity'] * 100,
         min(style['avg_sentence_length'] / 30 * 100, 100)  # Normalizar para max 30 palavras
     ]
-    
+
     # Fechar o radar
     values += values[:1]
     angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
     angles += angles[:1]
-    
+
     # Plot
     ax.plot(angles, values, 'o-', linewidth=2, color='darkblue')
     ax.fill(angles, values, alpha=0.25, color='skyblue')
-    
+
     # Labels
     ax.set_theta_offset(np.pi / 2)
     ax.set_theta_direction(-1)
@@ -175,32 +173,21 @@ def create_visualizations(results, person_name):
     ax.set_xticklabels(categories)
     ax.set_ylim(0, 100)
     ax.set_title(f'Perfil de Estilo de Escrita - {person_name}', y=1.08, fontsize=14)
-    
-    plt.tight_layout()
-    
+
     # Salvar
     radar_path = 'outputs/estilo_escrita_radar.png'
-    plt.savefig(radar_path, dpi=300, bbox_inches='tight')
+    fig.savefig(radar_path, dpi=200, bbox_inches='tight')
     print(f"  ✓ Radar de estilo salvo em: {radar_path}")
-    
-    plt.close('all')  # Fechar todas as figuras
 
 def analyze_multiple_people(person_emails, analyzer, max_people=5):
     """Analisa múltiplas pessoas para comparação"""
     
     print(f"\n🔍 Analisando {min(max_people, len(person_emails))} pessoas para comparação...")
-    
-    all_results = {}
-    
-    for i, (person, emails) in enumerate(person_emails.items()):
-        if i >= max_people:
-            break
-            
-        print(f"  • Analisando {person}... ({i+1}/{max_people})")
-        results = analyzer.analyze_person(emails, person)
-        all_results[person] = results
-    
-    return all_results
+
+    # Montar o subconjunto e analisar tudo em uma única chamada em lote
+    subset = dict(itertools.islice(person_emails.items(), max_people))
+
+    return analyzer.analyze_batch(subset)
 
 def create_comparison_visualization(all_results):
     """Cria visualização comparando múltiplas pessoas"""
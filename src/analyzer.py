@@ -1,16 +1,93 @@
 
-import nltk
+import numpy as np
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from collections import Counter, defaultdict
+from collections import Counter
+from operator import itemgetter
+from hashlib import blake2b
+import heapq
+import os
+import pickle
 import spacy
-from textstat import flesch_reading_ease, avg_sentence_length
 import re
 from typing import Dict, List, Tuple
 
+# itemgetter pré-ligado: evita um callback Python por comparação no heap
+_get1 = itemgetter(1)
+
+# numba é opcional: com ele o kernel de sílabas roda compilado; sem ele,
+# cai no mesmo loop em Python puro
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+@njit(cache=True)
+def _total_syllables(buf):
+    """Conta sílabas (grupos de vogais) de um buffer uint8 de palavras
+    minúsculas separadas por espaço, com espaço no final. Aproximação
+    clássica: grupos de vogais, descontando 'e' mudo final, mínimo 1."""
+    total = 0
+    vowels_in_word = 0
+    word_len = 0
+    prev_vowel = False
+    last_byte = 0
+
+    for i in range(buf.size):
+        b = buf[i]
+        if b == 32:  # espaço: fecha a palavra
+            if word_len > 0:
+                if last_byte == 101 and vowels_in_word > 1:  # 'e' mudo
+                    vowels_in_word -= 1
+                total += vowels_in_word if vowels_in_word > 0 else 1
+            vowels_in_word = 0
+            word_len = 0
+            prev_vowel = False
+            last_byte = 0
+        else:
+            word_len += 1
+            is_vowel = (b == 97 or b == 101 or b == 105 or
+                        b == 111 or b == 117 or b == 121)  # aeiouy
+            if is_vowel and not prev_vowel:
+                vowels_in_word += 1
+            prev_vowel = is_vowel
+            last_byte = b
+
+    return total
+
 class LinguisticAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, fast_tokens: bool = False,
+                 token_cache_dir: str = '.tokcache'):
+        # Caminho rápido opcional: para "palavras de email" um findall com
+        # regex pré-compilado bate o tokenizer do spaCy por larga margem e
+        # dispensa carregar o modelo. O spaCy continua sendo o padrão para
+        # quem quer a tokenização completa.
+        self.fast_tokens = fast_tokens
+        self._word_re = re.compile(r"[A-Za-z][A-Za-z']{2,}")
+        self._sent_re = re.compile(r'(?<=[.!?])\s+')
+
+        # Cache de tokenização em disco: os emails são idênticos entre
+        # execuções, então reanalisar a mesma pessoa vira um load de
+        # pickle em vez de outra passada do spaCy. None desliga.
+        self.token_cache_dir = token_cache_dir
+
+        if fast_tokens:
+            self.nlp = None
+        else:
+            # Só o tokenizer interessa aqui. exclude (e não disable) impede
+            # que parser/NER/tagger sejam sequer carregados — ~50 MB de
+            # pesos que ficariam mortos em RAM; a segmentação de sentenças
+            # vem do sentencizer leve (regras)
+            self.nlp = spacy.load(
+                "en_core_web_sm",
+                exclude=["tok2vec", "parser", "ner", "tagger",
+                         "lemmatizer", "attribute_ruler"]
+            )
+            if "sentencizer" not in self.nlp.pipe_names:
+                self.nlp.add_pipe("sentencizer")
+
         self.stop_words = set(stopwords.words('english'))
         
         # Adicionar stop words corporativas comuns
@@ -19,228 +96,566 @@ class LinguisticAnalyzer:
             'forwarded', 'original', 'message', 'wrote', 'date'
         }
         self.stop_words.update(self.corporate_stopwords)
+
+        # Regexes compilados uma vez: um único finditer O(N) substitui as
+        # dezenas de passadas .count() sobre o corpus concatenado
+        self._transition_words = (
+            'however', 'therefore', 'moreover', 'furthermore',
+            'nevertheless', 'consequently', 'additionally',
+            'meanwhile', 'otherwise', 'accordingly'
+        )
+        self._transition_re = re.compile(
+            r'\b(?:' + '|'.join(self._transition_words) + r')\b'
+        )
+        # Grupos na ordem dos buckets de ênfase; CAPS vem primeiro para
+        # "REALLY" contar como caps lock
+        self._emphasis_re = re.compile(
+            r'\b(?:([A-Z]{3,})|((?i:very|really))|((?i:absolutely|definitely)))\b'
+        )
+        # Saudações: despacho pelo primeiro token (comparações de string
+        # em C), sem máquina de estados de regex por email
+        self._greeting_styles = ('informal', 'formal', 'time_based', 'name_only')
+        self._greeting_informal = frozenset({'hi', 'hello', 'hey'})
+        self._greeting_formal = frozenset({'dear', 'greetings'})
+        self._greeting_times = ('morning', 'afternoon', 'evening')
+        # Assinaturas: padrões compilados uma vez; cada um pode contar
+        # no máximo 1 por email (um email pode ter mais de um estilo)
+        self._signature_styles = ('formal', 'grateful', 'casual', 'minimal')
+        self._signature_res = (
+            re.compile(r'(best|regards|sincerely)'),
+            re.compile(r'(thanks|thx|ty)'),
+            re.compile(r'(cheers|talk soon)'),
+            re.compile(r'^-\s*\w+')
+        )
         
     def analyze_person(self, emails: List[str], person_name: str) -> Dict:
         """Análise completa dos padrões linguísticos de uma pessoa"""
-        
-        # Juntar todos os emails
-        full_text = ' '.join(emails)
-        
+        return self._analyze_core(emails, person_name)
+
+    def analyze_text(self, text: str, person_id: str = 'custom') -> Dict:
+        """Analisa um texto avulso diretamente, sem os padrões específicos
+        de email (saudação/assinatura não fazem sentido em texto corrido)"""
+        return self._analyze_core([text], person_id, skip_email_patterns=True)
+
+    def _analyze_core(self, emails: List[str], person_name: str,
+                      skip_email_patterns: bool = False) -> Dict:
+        # Tokenizar cada email exatamente uma vez; todas as métricas
+        # consomem as estruturas cacheadas em vez de retokenizar
+        corpus = self._tokenize_corpus(emails)
+
+        return self._finalize(emails, corpus, person_name, skip_email_patterns)
+
+    def analyze_batch(self, people_emails: Dict[str, List[str]],
+                      n_process: int = None) -> Dict[str, Dict]:
+        """Analisa várias pessoas em uma única chamada. Todos os emails de
+        todas as pessoas passam por um único nlp.pipe — paralelizado entre
+        processos quando há mais de um núcleo — e os docs são reduzidos por
+        pessoa antes da etapa de estatísticas."""
+        if self.fast_tokens:
+            # Sem pipe do spaCy para paralelizar: tokenização barata por
+            # pessoa, que já é dominada pela etapa de estatísticas
+            return {
+                person: self._analyze_core(emails, person)
+                for person, emails in people_emails.items()
+            }
+
+        if n_process is None:
+            n_process = max(1, (os.cpu_count() or 2) - 1)
+
+        # Quem já tem tokenização em cache nem entra no pipe
+        buckets = {}
+        pending = {}
+        for person, emails in people_emails.items():
+            cached = self._load_cached_tokens(emails)
+            if cached is not None:
+                buckets[person] = cached
+            else:
+                pending[person] = emails
+
+        # Stream achatado (email, pessoa) para o pipe; as_tuples devolve o
+        # doc junto com o dono
+        flat = (
+            (email, person)
+            for person, emails in pending.items()
+            for email in emails
+        )
+
+        fresh = {person: ([], [], []) for person in pending}
+        if pending:
+            for doc, person in self.nlp.pipe(flat, as_tuples=True,
+                                             batch_size=256, n_process=n_process):
+                toks, toks_lower, sents = self._extract_doc(doc)
+                email_tokens, email_tokens_lower, email_sents = fresh[person]
+                email_tokens.append(toks)
+                email_tokens_lower.append(toks_lower)
+                email_sents.append(sents)
+
+        for person, extracted in fresh.items():
+            self._store_cached_tokens(pending[person], extracted)
+            buckets[person] = extracted
+
+        results = {}
+        for person in people_emails:
+            email_tokens, email_tokens_lower, email_sents = buckets[person]
+            corpus = self._build_corpus(email_tokens, email_tokens_lower, email_sents)
+            results[person] = self._finalize(people_emails[person], corpus, person)
+
+        return results
+
+    def _finalize(self, emails: List[str], corpus: Dict, person_name: str,
+                  skip_email_patterns: bool = False) -> Dict:
+        """Etapa de estatísticas sobre um corpus já tokenizado"""
+        # Minúsculas calculadas uma única vez: cada .lower() sobre um email
+        # grande aloca e copia o buffer inteiro, então os consumidores
+        # (transições, saudações, assinaturas) reusam esta lista
+        emails_lc = [email.lower() for email in emails]
+
+        # Pontuação contada uma vez só sobre todos os emails
+        char_stats = self._count_chars(emails)
+
+        # Uma passada única pelos tokens alimenta unigrams, trigrams e as
+        # contagens de diversidade ao mesmo tempo
+        uni, top_phrases, meaningful_words, n_unique, n_upper = self._fused_counts(
+            corpus['email_tokens'], corpus['email_tokens_lower']
+        )
+
         analysis = {
             'person': person_name,
             'total_emails': len(emails),
-            'comfort_words': self._get_comfort_words(full_text),
-            'favorite_phrases': self._get_favorite_phrases(emails),
-            'writing_style': self._analyze_writing_style(full_text),
-            'vocabulary_diversity': self._calculate_diversity(full_text),
-            'linguistic_fingerprint': self._create_fingerprint(emails),
-            'email_patterns': self._analyze_email_patterns(emails)
+            'comfort_words': uni.most_common(30),
+            'favorite_phrases': top_phrases,
+            'writing_style': self._analyze_writing_style(corpus, char_stats, n_upper),
+            'vocabulary_diversity': self._calculate_diversity(meaningful_words, n_unique),
+            'linguistic_fingerprint': self._create_fingerprint(emails, corpus, emails_lc),
+            'email_patterns': (
+                {} if skip_email_patterns
+                else self._analyze_email_patterns(emails, emails_lc)
+            )
         }
-        
+
         return analysis
-    
-    def _get_comfort_words(self, text: str, top_n: int = 30) -> List[Tuple[str, int]]:
-        """Identifica as palavras mais usadas (excluindo stopwords)"""
-        words = word_tokenize(text.lower())
-        
-        # Filtrar palavras relevantes
-        meaningful_words = [
-            word for word in words 
-            if word.isalpha() 
-            and word not in self.stop_words 
-            and len(word) > 3
-        ]
-        
-        return Counter(meaningful_words).most_common(top_n)
-    
-    def _get_favorite_phrases(self, emails: List[str], n_gram: int = 3) -> List[Tuple[str, int]]:
-        """Identifica frases/expressões favoritas (bigrams e trigrams)"""
-        all_phrases = []
-        
+
+    def _extract_doc(self, doc) -> Tuple[List[str], List[str], List[str]]:
+        """Extrai de um doc os tokens alfabéticos (caixa original e
+        minúsculos) e as sentenças"""
+        toks = []
+        toks_lower = []
+        for tok in doc:
+            if tok.is_alpha:
+                toks.append(tok.text)
+                toks_lower.append(tok.lower_)
+
+        return toks, toks_lower, [sent.text.strip() for sent in doc.sents]
+
+    def _cheap_extract(self, text: str) -> Tuple[List[str], List[str], List[str]]:
+        """Tokenização barata: findall de palavras alfabéticas e split de
+        sentenças por pontuação final. Sem regras Penn-Treebank, mas para
+        contagem de palavras o resultado é equivalente."""
+        toks = self._word_re.findall(text)
+        toks_lower = [t.lower() for t in toks]
+        sents = [s.strip() for s in self._sent_re.split(text) if s.strip()]
+
+        return toks, toks_lower, sents
+
+    def _build_corpus(self, email_tokens: List[List[str]],
+                      email_tokens_lower: List[List[str]],
+                      email_sents: List[List[str]]) -> Dict:
+        return {
+            'email_tokens': email_tokens,
+            'email_tokens_lower': email_tokens_lower,
+            'email_sents': email_sents,
+            'tokens': [t for toks in email_tokens for t in toks],
+            'tokens_lower': [t for toks in email_tokens_lower for t in toks],
+            'sentences': [s for sents in email_sents for s in sents]
+        }
+
+    def _token_cache_path(self, emails: List[str]) -> str:
+        """Caminho do cache para esta lista de emails: blake2b do
+        conteúdo concatenado identifica o corpus de forma estável.
+        O modo de tokenização entra na chave — os tokens do caminho
+        rápido e os do spaCy não são intercambiáveis"""
+        h = blake2b(digest_size=16)
+        h.update(b'fast' if self.fast_tokens else b'spacy')
         for email in emails:
-            words = word_tokenize(email.lower())
-            
-            # Criar n-grams
-            for i in range(len(words) - n_gram + 1):
-                phrase = ' '.join(words[i:i + n_gram])
-                
-                # Filtrar frases com substância
-                if all(word not in self.stop_words or word in ['not', 'very', 'really'] 
-                       for word in words[i:i + n_gram]):
-                    all_phrases.append(phrase)
-        
-        return Counter(all_phrases).most_common(20)
+            h.update(email.encode('utf-8', 'ignore'))
+            h.update(b'\x00')
+
+        return os.path.join(self.token_cache_dir, h.hexdigest() + '.pkl')
+
+    def _load_cached_tokens(self, emails: List[str]):
+        """Devolve (tokens, tokens_lower, sents) do disco, ou None"""
+        if not self.token_cache_dir:
+            return None
+
+        path = self._token_cache_path(emails)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _store_cached_tokens(self, emails: List[str], extracted) -> None:
+        if not self.token_cache_dir:
+            return
+
+        os.makedirs(self.token_cache_dir, exist_ok=True)
+        with open(self._token_cache_path(emails), 'wb') as f:
+            pickle.dump(extracted, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _tokenize_corpus(self, emails: List[str]) -> Dict:
+        """Tokeniza o corpus inteiro em lote via nlp.pipe e devolve as
+        estruturas compartilhadas: tokens alfabéticos por email (caixa
+        original e minúsculos), sentenças por email e as versões achatadas.
+        Antes cada métrica chamava word_tokenize/sent_tokenize de novo
+        sobre o mesmo texto — 5-6 tokenizações redundantes por pessoa."""
+        cached = self._load_cached_tokens(emails)
+        if cached is not None:
+            return self._build_corpus(*cached)
+
+        email_tokens = []
+        email_tokens_lower = []
+        email_sents = []
+
+        if self.fast_tokens:
+            extracted = (self._cheap_extract(email) for email in emails)
+        else:
+            extracted = (
+                self._extract_doc(doc)
+                for doc in self.nlp.pipe(emails, batch_size=256)
+            )
+
+        for toks, toks_lower, sents in extracted:
+            email_tokens.append(toks)
+            email_tokens_lower.append(toks_lower)
+            email_sents.append(sents)
+
+        self._store_cached_tokens(
+            emails, (email_tokens, email_tokens_lower, email_sents)
+        )
+
+        return self._build_corpus(email_tokens, email_tokens_lower, email_sents)
+
+
+    def _fused_counts(self, email_tokens: List[List[str]],
+                      email_tokens_lower: List[List[str]]):
+        """Uma única varredura dos tokens alimenta simultaneamente o
+        contador de unigrams (vícios), o stream de trigrams (frases
+        favoritas), a lista de palavras relevantes, o conjunto de
+        palavras únicas e a contagem de tokens em CAIXA ALTA. Antes
+        eram três passadas independentes, cada uma com sua lista
+        intermediária e seu Counter.
+
+        Os trigrams nem viram strings aqui: cada janela aceita empacota
+        três IDs inteiros de vocabulário (21 bits cada) em uma chave
+        uint64, e o top-20 sai de um np.unique em C. Só as 20 frases
+        vencedoras são remontadas como texto."""
+        stop = self.stop_words
+        allow = {'not', 'very', 'really'}
+
+        uni = Counter()
+        meaningful_words = []
+        unique_words = set()
+        n_upper = 0
+
+        # Vocabulário incremental token -> ID (só tokens elegíveis);
+        # 21 bits por ID comportam ~2M tokens distintos, ordens de
+        # grandeza acima de qualquer remetente do Enron
+        vocab = {}
+        keys = []
+
+        for words_orig, words in zip(email_tokens, email_tokens_lower):
+            n = len(words)
+            # Bitset de elegibilidade: cada token consulta as stop words
+            # UMA vez aqui; a janela de trigrams depois lê três bytes em
+            # vez de refazer três lookups de hash por posição
+            ok = bytearray(n)
+            ids = [0] * n
+            for i, token in enumerate(words):
+                # Caixa alta verificada no token original (o lowered
+                # nunca passaria), no mesmo loop — zero passada extra
+                if words_orig[i].isupper():
+                    n_upper += 1
+
+                if token not in stop:
+                    meaningful_words.append(token)
+                    unique_words.add(token)
+                    if len(token) > 3:
+                        uni[token] += 1
+                    ok[i] = 1
+                elif token in allow:
+                    ok[i] = 1
+
+                if ok[i]:
+                    vid = vocab.get(token)
+                    if vid is None:
+                        vid = len(vocab)
+                        vocab[token] = vid
+                    ids[i] = vid
+
+            # Trigrams não atravessam a fronteira entre emails
+            for i in range(2, n):
+                if ok[i - 2] and ok[i - 1] and ok[i]:
+                    keys.append((ids[i - 2] << 42) | (ids[i - 1] << 21) | ids[i])
+
+        top_phrases = self._top_trigrams(keys, vocab)
+
+        return uni, top_phrases, meaningful_words, len(unique_words), n_upper
+
+    def _top_trigrams(self, keys: List[int], vocab: Dict[str, int],
+                      k: int = 20) -> List[Tuple[str, int]]:
+        """Top-K exato das chaves empacotadas: np.unique conta em C e
+        argpartition isola os K maiores sem ordenar tudo"""
+        if not keys:
+            return []
+
+        arr = np.fromiter(keys, dtype=np.uint64, count=len(keys))
+        uniq, counts = np.unique(arr, return_counts=True)
+
+        if counts.size > k:
+            part = np.argpartition(counts, -k)[-k:]
+            uniq, counts = uniq[part], counts[part]
+
+        order = np.argsort(counts)[::-1]
+
+        inv = [''] * len(vocab)
+        for token, vid in vocab.items():
+            inv[vid] = token
+
+        mask = (1 << 21) - 1
+        top = []
+        for j in order:
+            key = int(uniq[j])
+            phrase = (inv[key >> 42] + ' '
+                      + inv[(key >> 21) & mask] + ' '
+                      + inv[key & mask])
+            top.append((phrase, int(counts[j])))
+
+        return top
     
-    def _analyze_writing_style(self, text: str) -> Dict:
-        """Analisa o estilo de escrita"""
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text)
-        
+    def _count_chars(self, emails: List[str]) -> Dict:
+        """Um Counter sobre os caracteres dá todas as frequências de
+        pontuação em uma única passada C — antes eram sete varreduras de
+        regex, uma por símbolo. Só as reticências (substring de 3 chars)
+        precisam de um count dedicado."""
+        char_counts = Counter()
+        ellipses = 0
+        total_chars = 0
+
+        for email in emails:
+            char_counts.update(email)
+            ellipses += email.count('...')
+            total_chars += len(email)
+
+        return {
+            'exclamations': char_counts['!'],
+            'questions': char_counts['?'],
+            'ellipses': ellipses,
+            'dashes': char_counts['-'] + char_counts['—'],
+            'parens': char_counts['('],
+            'semicolons': char_counts[';'],
+            'total_chars': total_chars
+        }
+
+    def _reading_ease(self, alpha_words: List[str], n_sentences: int) -> float:
+        """Flesch reading ease calculado aqui mesmo: a contagem de sílabas
+        roda em um único kernel (numba) sobre o buffer de bytes das
+        palavras, em vez do loop palavra a palavra do textstat"""
+        if not alpha_words or n_sentences == 0:
+            return 0.0
+
+        buf = np.frombuffer(
+            (' '.join(alpha_words) + ' ').encode('ascii', 'ignore'),
+            dtype=np.uint8
+        )
+        syllables = _total_syllables(buf)
+
+        n_words = len(alpha_words)
+        return (206.835
+                - 1.015 * (n_words / n_sentences)
+                - 84.6 * (syllables / n_words))
+
+    def _analyze_writing_style(self, corpus: Dict, char_stats: Dict,
+                               n_upper: int) -> Dict:
+        """Analisa o estilo de escrita (sobre o corpus já tokenizado;
+        n_upper vem pronto da passada única de contagem)"""
+        n_sentences = len(corpus['sentences'])
+        n_words = len(corpus['tokens'])
+        alpha_words = corpus['tokens_lower']
+
         style = {
-            'avg_sentence_length': avg_sentence_length(text),
-            'reading_ease': flesch_reading_ease(text),
-            'exclamation_usage': text.count('!') / len(sentences),
-            'question_usage': text.count('?') / len(sentences),
-            'uppercase_ratio': sum(1 for w in words if w.isupper()) / len(words),
-            'punctuation_style': self._analyze_punctuation(text)
+            'avg_sentence_length': len(alpha_words) / n_sentences if n_sentences else 0,
+            'reading_ease': self._reading_ease(alpha_words, n_sentences),
+            'exclamation_usage': char_stats['exclamations'] / n_sentences if n_sentences else 0,
+            'question_usage': char_stats['questions'] / n_sentences if n_sentences else 0,
+            'uppercase_ratio': n_upper / n_words if n_words else 0,
+            'punctuation_style': self._analyze_punctuation(char_stats)
         }
-        
+
         return style
     
-    def _calculate_diversity(self, text: str) -> Dict:
-        """Calcula métricas de diversidade vocabular"""
-        words = word_tokenize(text.lower())
-        meaningful_words = [w for w in words if w.isalpha() and w not in self.stop_words]
-        
-        unique_words = set(meaningful_words)
-        
+    def _calculate_diversity(self, meaningful_words: List[str], n_unique: int) -> Dict:
+        """Calcula métricas de diversidade vocabular (sobre as contagens
+        já produzidas pela passada única)"""
         diversity = {
             'total_words': len(meaningful_words),
-            'unique_words': len(unique_words),
-            'lexical_diversity': len(unique_words) / len(meaningful_words) if meaningful_words else 0,
+            'unique_words': n_unique,
+            'lexical_diversity': n_unique / len(meaningful_words) if meaningful_words else 0,
             'vocabulary_richness': self._calculate_ttr(meaningful_words)
         }
-        
+
         return diversity
     
     def _calculate_ttr(self, words: List[str]) -> float:
         """Type-Token Ratio para medir riqueza vocabular"""
         if not words:
             return 0
-        
-        # Calcular TTR em chunks de 1000 palavras (mais estável)
+
+        # Calcular TTR em chunks de 1000 palavras (mais estável).
+        # Um único set reutilizado com clear(): os buckets internos já
+        # alocados servem para todos os chunks, em vez de construir e
+        # descartar um set novo a cada 1000 palavras
         chunk_size = 1000
         ttrs = []
-        
+        seen = set()
+
         for i in range(0, len(words), chunk_size):
             chunk = words[i:i + chunk_size]
             if len(chunk) > 100:  # Chunks muito pequenos não são confiáveis
-                ttr = len(set(chunk)) / len(chunk)
-                ttrs.append(ttr)
-        
+                seen.clear()
+                seen.update(chunk)
+                ttrs.append(len(seen) / len(chunk))
+
         return sum(ttrs) / len(ttrs) if ttrs else 0
     
-    def _create_fingerprint(self, emails: List[str]) -> Dict:
+    def _create_fingerprint(self, emails: List[str], corpus: Dict,
+                            emails_lc: List[str]) -> Dict:
         """Cria uma 'impressão digital' linguística única"""
         fingerprint = {
-            'starter_phrases': self._get_email_starters(emails),
-            'closing_phrases': self._get_email_closings(emails),
-            'transition_words': self._get_transition_preferences(emails),
+            'starter_phrases': self._get_email_starters(corpus['email_sents']),
+            'closing_phrases': self._get_email_closings(corpus['email_sents']),
+            'transition_words': self._get_transition_preferences(emails_lc),
             'emphasis_patterns': self._get_emphasis_patterns(emails)
         }
-        
+
         return fingerprint
-    
-    def _get_email_starters(self, emails: List[str]) -> List[Tuple[str, int]]:
+
+    def _get_email_starters(self, email_sents: List[List[str]]) -> List[Tuple[str, int]]:
         """Como a pessoa geralmente começa emails"""
         starters = []
-        
-        for email in emails:
-            sentences = sent_tokenize(email)
+
+        for sentences in email_sents:
             if sentences:
                 first = sentences[0][:50]  # Primeiros 50 chars
                 starters.append(first)
-        
-        return Counter(starters).most_common(5)
-    
-    def _get_email_closings(self, emails: List[str]) -> List[Tuple[str, int]]:
+
+        # nlargest direto nos items evita a heap interna do most_common
+        # com comparações de tuplas completas
+        return heapq.nlargest(5, Counter(starters).items(), key=_get1)
+
+    def _get_email_closings(self, email_sents: List[List[str]]) -> List[Tuple[str, int]]:
         """Como a pessoa geralmente termina emails"""
         closings = []
-        
-        for email in emails:
-            sentences = sent_tokenize(email)
+
+        for sentences in email_sents:
             if sentences:
                 last = sentences[-1][-50:]  # Últimos 50 chars
                 closings.append(last)
-        
-        return Counter(closings).most_common(5)
+
+        return heapq.nlargest(5, Counter(closings).items(), key=_get1)
     
-    def _get_transition_preferences(self, emails: List[str]) -> Dict:
-        """Palavras de transição preferidas"""
-        transitions = ['however', 'therefore', 'moreover', 'furthermore',
-                      'nevertheless', 'consequently', 'additionally',
-                      'meanwhile', 'otherwise', 'accordingly']
-        
-        text = ' '.join(emails).lower()
-        usage = {word: text.count(word) for word in transitions}
-        
-        return dict(sorted(usage.items(), key=lambda x: x[1], reverse=True)[:5])
+    def _get_transition_preferences(self, emails_lc: List[str]) -> Dict:
+        """Palavras de transição preferidas (emails já em minúsculas)"""
+        text = ' '.join(emails_lc)
+
+        # Uma única passada do regex combinado em vez de um .count() por
+        # palavra (10 varreduras completas do texto)
+        counts = Counter(m.group(0) for m in self._transition_re.finditer(text))
+
+        return dict(heapq.nlargest(
+            5,
+            ((word, counts.get(word, 0)) for word in self._transition_words),
+            key=_get1
+        ))
     
     def _get_emphasis_patterns(self, emails: List[str]) -> Dict:
         """Como a pessoa enfatiza pontos"""
+        buckets = ('all_caps', 'very_really', 'absolutely_definitely')
         patterns = {
             'all_caps': 0,
             'repetition': 0,
             'very_really': 0,
             'absolutely_definitely': 0
         }
-        
+
+        # Um finditer por email alimenta os três buckets de uma vez; o \b
+        # também deixa de contar 'very' dentro de 'delivery' etc.
         for email in emails:
-            patterns['all_caps'] += len(re.findall(r'\b[A-Z]{3,}\b', email))
-            patterns['very_really'] += email.lower().count('very') + email.lower().count('really')
-            patterns['absolutely_definitely'] += email.lower().count('absolutely') + email.lower().count('definitely')
-        
+            for match in self._emphasis_re.finditer(email):
+                patterns[buckets[match.lastindex - 1]] += 1
+
         return patterns
     
-    def _analyze_email_patterns(self, emails: List[str]) -> Dict:
+    def _analyze_email_patterns(self, emails: List[str], emails_lc: List[str]) -> Dict:
         """Padrões específicos de email"""
         patterns = {
             'avg_email_length': sum(len(e.split()) for e in emails) / len(emails),
-            'greeting_style': self._analyze_greetings(emails),
-            'signature_style': self._analyze_signatures(emails)
+            'greeting_style': self._analyze_greetings(emails_lc),
+            'signature_style': self._analyze_signatures(emails_lc)
         }
         
         return patterns
     
-    def _analyze_greetings(self, emails: List[str]) -> Dict:
-        """Analisa estilos de saudação"""
-        greetings = defaultdict(int)
-        
-        greeting_patterns = [
-            (r'^(hi|hello|hey)\s+\w+', 'informal'),
-            (r'^(dear|greetings)\s+\w+', 'formal'),
-            (r'^(good\s+(morning|afternoon|evening))', 'time_based'),
-            (r'^\w+,', 'name_only')
-        ]
-        
-        for email in emails:
-            email_lower = email.lower().strip()
-            for pattern, style in greeting_patterns:
-                if re.match(pattern, email_lower):
-                    greetings[style] += 1
-                    break
-        
-        return dict(greetings)
-    
-    def _analyze_signatures(self, emails: List[str]) -> Dict:
-        """Analisa estilos de assinatura"""
-        signatures = defaultdict(int)
-        
-        signature_patterns = [
-            (r'(best|regards|sincerely)', 'formal'),
-            (r'(thanks|thx|ty)', 'grateful'),
-            (r'(cheers|talk soon)', 'casual'),
-            (r'^-\s*\w+', 'minimal')
-        ]
-        
-        for email in emails:
+    def _analyze_greetings(self, emails_lc: List[str]) -> Dict:
+        """Analisa estilos de saudação (emails já em minúsculas)"""
+        counts = [0, 0, 0, 0]
+        informal = self._greeting_informal
+        formal = self._greeting_formal
+        times = self._greeting_times
+
+        # Cadeia de comparações sobre os dois primeiros tokens: um split
+        # limitado + lookups em frozenset no lugar do regex por email
+        for email in emails_lc:
+            parts = email.lstrip().split(None, 2)
+            if not parts:
+                continue
+
+            first = parts[0]
+            if first in informal:
+                if len(parts) > 1:
+                    counts[0] += 1
+            elif first in formal:
+                if len(parts) > 1:
+                    counts[1] += 1
+            elif first == 'good' and len(parts) > 1 and parts[1].startswith(times):
+                counts[2] += 1
+            elif first.endswith(','):
+                counts[3] += 1
+
+        return dict(zip(self._greeting_styles, counts))
+
+    def _analyze_signatures(self, emails_lc: List[str]) -> Dict:
+        """Analisa estilos de assinatura (emails já em minúsculas)"""
+        counts = [0, 0, 0, 0]
+        patterns = self._signature_res
+
+        for email in emails_lc:
             # Pegar últimas linhas
             lines = email.strip().split('\n')
-            last_lines = ' '.join(lines[-3:]).lower()
-            
-            for pattern, style in signature_patterns:
-                if re.search(pattern, last_lines):
-                    signatures[style] += 1
-        
-        return dict(signatures)
+            last_lines = ' '.join(lines[-3:])
+
+            for i, pattern in enumerate(patterns):
+                if pattern.search(last_lines):
+                    counts[i] += 1
+
+        return dict(zip(self._signature_styles, counts))
     
-    def _analyze_punctuation(self, text: str) -> Dict:
-        """Analisa uso de pontuação"""
-        total_chars = len(text)
-        
+    def _analyze_punctuation(self, char_stats: Dict) -> Dict:
+        """Analisa uso de pontuação (a partir das contagens vetorizadas)"""
+        total_chars = char_stats['total_chars']
+
         return {
-            'ellipsis_usage': text.count('...') / total_chars * 1000,
-            'dash_usage': (text.count('-') + text.count('—')) / total_chars * 1000,
-            'parenthesis_usage': text.count('(') / total_chars * 1000,
-            'semicolon_usage': text.count(';') / total_chars * 1000
+            'ellipsis_usage': char_stats['ellipses'] / total_chars * 1000,
+            'dash_usage': char_stats['dashes'] / total_chars * 1000,
+            'parenthesis_usage': char_stats['parens'] / total_chars * 1000,
+            'semicolon_usage': char_stats['semicolons'] / total_chars * 1000
         }
\ No newline at end of file